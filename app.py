@@ -3,6 +3,9 @@
 Educational tool for analyzing crash game probabilities
 """
 
+import re
+from typing import Dict, List
+
 import streamlit as st
 import pandas as pd
 import numpy as np
@@ -14,10 +17,12 @@ from utils.calculator import (
     simulate_rounds,
     calculate_expected_value,
     kelly_criterion,
-    risk_of_ruin_simulation
+    risk_of_ruin_simulation,
+    summarize_strategy
 )
 from utils.visualizations import (
     create_probability_chart,
+    create_welcome_chart,
     create_simulation_chart,
     create_histogram_chart
 )
@@ -30,8 +35,7 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -50,33 +54,123 @@ st.markdown("""
         margin: 1rem 0;
     }
     
-    .result-card {
-        background: linear-gradient(135deg, #f6f8ff, #ffffff);
-        border-radius: 10px;
-        padding: 1.5rem;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.05);
+    .metric-card {
+        background: white;
+        padding: 1rem;
+        border-radius: 8px;
+        box-shadow: 0 2px 4px rgba(0,0,0,0.05);
         border: 1px solid #e2e8f0;
     }
     
-    .positive {
-        color: #38a169;
-        font-weight: bold;
+    .metric-card .label {
+        font-size: 0.875rem;
+        color: #4a5568;
     }
     
-    .negative {
-        color: #e53e3e;
-        font-weight: bold;
+    .metric-card .value {
+        font-size: 2rem;
+        font-weight: 600;
+        color: #1a202c;
     }
     
-    .metric-card {
-        background: white;
-        padding: 1rem;
-        border-radius: 8px;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-        border: 1px solid #e2e8f0;
+    .metric-card .delta {
+        font-size: 0.875rem;
+        color: #38a169;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+@st.cache_resource
+def minified_css() -> str:
+    """Collapse CUSTOM_CSS whitespace once per server to shrink each rerun's payload."""
+    return re.sub(r"\s*([{};:,])\s*", r"\1", re.sub(r"\s+", " ", CUSTOM_CSS)).strip()
+
+@st.cache_data(max_entries=64)
+def cached_simulate_rounds(
+    num_simulations: int,
+    num_rounds: int,
+    bet_amount: float,
+    target_multiplier: float,
+    house_edge: float,
+    initial_bankroll: float,
+    strategy: str,
+    seed: int
+) -> pd.DataFrame:
+    """Memoized simulate_rounds, keyed on all inputs including the seed."""
+    return simulate_rounds(
+        num_simulations=num_simulations,
+        num_rounds=num_rounds,
+        bet_amount=bet_amount,
+        target_multiplier=target_multiplier,
+        house_edge=house_edge,
+        initial_bankroll=initial_bankroll,
+        strategy=strategy,
+        seed=seed
+    )
+
+@st.cache_data(max_entries=64)
+def cached_risk_of_ruin(
+    initial_bankroll: float,
+    bet_amount: float,
+    target_multiplier: float,
+    house_edge: float,
+    num_rounds: int,
+    num_simulations: int,
+    seed: int
+) -> float:
+    """Memoized risk_of_ruin_simulation, keyed on all inputs including the seed."""
+    return risk_of_ruin_simulation(
+        initial_bankroll=initial_bankroll,
+        bet_amount=bet_amount,
+        target_multiplier=target_multiplier,
+        house_edge=house_edge,
+        num_rounds=num_rounds,
+        num_simulations=num_simulations,
+        seed=seed
+    )
+
+@st.cache_data(max_entries=64)
+def cached_strategy_comparison(
+    strategies: List[str],
+    num_simulations: int,
+    num_rounds: int,
+    bet_amount: float,
+    target_multiplier: float,
+    house_edge: float,
+    initial_bankroll: float,
+    seed: int
+) -> List[Dict[str, float]]:
+    """Simulate and summarize each strategy, keyed on all inputs including the seed."""
+    summaries = []
+    for strat in strategies:
+        results = simulate_rounds(
+            num_simulations=num_simulations,
+            num_rounds=num_rounds,
+            bet_amount=bet_amount,
+            target_multiplier=target_multiplier,
+            house_edge=house_edge,
+            initial_bankroll=initial_bankroll,
+            strategy=strat,
+            seed=seed
+        )
+        summaries.append(summarize_strategy(strat, results, initial_bankroll))
+    return summaries
+
+@st.cache_data
+def cached_crash_probability(house_edge: float, multiplier: float) -> float:
+    """Memoized calculate_crash_probability."""
+    return calculate_crash_probability(house_edge, multiplier)
+
+def metric_card(col, label: str, value: str, delta: str) -> None:
+    """Render a complete metric card with a single markdown call."""
+    col.markdown(
+        f"<div class='metric-card'><div class='label'>{label}</div>"
+        f"<div class='value'>{value}</div><div class='delta'>{delta}</div></div>",
+        unsafe_allow_html=True
+    )
+
+# Custom CSS (must be emitted on every run or Streamlit drops it)
+st.markdown(minified_css(), unsafe_allow_html=True)
 
 # Header
 st.markdown('<h1 class="main-header">✈️ Aviator Probability Calculator</h1>', unsafe_allow_html=True)
@@ -164,6 +258,14 @@ with st.sidebar:
             help="Percentage of Kelly Criterion to use"
         )
         
+        seed = st.number_input(
+            "Random Seed",
+            min_value=0,
+            value=42,
+            step=1,
+            help="Same seed and parameters reproduce the same simulation"
+        )
+        
         show_advanced_stats = st.checkbox("Show Advanced Statistics")
         show_code = st.checkbox("Show Mathematical Formulas")
     
@@ -179,7 +281,7 @@ with st.sidebar:
 # Main content area
 if run_simulation:
     # Calculate probabilities
-    crash_prob = calculate_crash_probability(house_edge, target_multiplier)
+    crash_prob = cached_crash_probability(house_edge, target_multiplier)
     success_prob = 1 - crash_prob
     
     # Calculate expected value
@@ -190,14 +292,15 @@ if run_simulation:
     )
     
     # Run Monte Carlo simulation
-    results = simulate_rounds(
+    results = cached_simulate_rounds(
         num_simulations=num_simulations,
         num_rounds=num_rounds,
         bet_amount=bet_amount,
         target_multiplier=target_multiplier,
         house_edge=house_edge,
         initial_bankroll=initial_bankroll,
-        strategy=strategy
+        strategy=strategy,
+        seed=seed
     )
     
     # Calculate Kelly Criterion
@@ -208,53 +311,33 @@ if run_simulation:
     kelly_bet = max(0, kelly_fraction / 100 * kelly * initial_bankroll)
     
     # Risk of ruin calculation
-    risk_of_ruin = risk_of_ruin_simulation(
+    risk_of_ruin = cached_risk_of_ruin(
         initial_bankroll=initial_bankroll,
         bet_amount=bet_amount,
         target_multiplier=target_multiplier,
         house_edge=house_edge,
         num_rounds=num_rounds,
-        num_simulations=1000
+        num_simulations=1000,
+        seed=seed
     )
     
     # Display key metrics
     col1, col2, col3, col4 = st.columns(4)
     
-    with col1:
-        st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-        st.metric(
-            "Success Probability",
-            f"{success_prob*100:.2f}%",
-            f"1 in {int(1/success_prob):,}"
-        )
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-        st.metric(
-            "Expected Value",
-            f"${ev:.2f}",
-            "per round"
-        )
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-        st.metric(
-            "House Edge",
-            f"{house_edge}%",
-            f"RTP: {100 - house_edge}%"
-        )
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    with col4:
-        st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-        st.metric(
-            "Risk of Ruin",
-            f"{risk_of_ruin:.1f}%",
-            f"after {num_rounds} rounds"
-        )
-        st.markdown('</div>', unsafe_allow_html=True)
+    metric_card(
+        col1,
+        "Success Probability",
+        f"{success_prob*100:.2f}%",
+        f"1 in {int(1/success_prob):,}"
+    )
+    metric_card(col2, "Expected Value", f"${ev:.2f}", "per round")
+    metric_card(col3, "House Edge", f"{house_edge}%", f"RTP: {100 - house_edge}%")
+    metric_card(
+        col4,
+        "Risk of Ruin",
+        f"{risk_of_ruin:.1f}%",
+        f"after {num_rounds} rounds"
+    )
     
     # Probability distribution chart
     st.subheader("📊 Probability Distribution")
@@ -267,23 +350,18 @@ if run_simulation:
     
     col1, col2 = st.columns(2)
     
-    with col1:
-        st.markdown('<div class="result-card">', unsafe_allow_html=True)
+    # Result charts, each in a bordered card
+    with col1.container(border=True):
         st.write("**Final Balance Distribution**")
         
-        fig2 = create_simulation_chart(results)
+        fig2 = create_simulation_chart(results, house_edge, target_multiplier)
         st.plotly_chart(fig2, use_container_width=True)
-        
-        st.markdown('</div>', unsafe_allow_html=True)
     
-    with col2:
-        st.markdown('<div class="result-card">', unsafe_allow_html=True)
+    with col2.container(border=True):
         st.write("**Round-by-Round Performance**")
         
         fig3 = create_histogram_chart(results)
         st.plotly_chart(fig3, use_container_width=True)
-        
-        st.markdown('</div>', unsafe_allow_html=True)
     
     # Detailed statistics
     with st.expander("📋 Detailed Statistics"):
@@ -307,45 +385,39 @@ if run_simulation:
         with col2:
             st.write("**Probability Table**")
             multipliers = [1.5, 2, 3, 5, 10, 20, 50, 100]
-            prob_data = []
-            
-            for mult in multipliers:
-                prob = 1 - calculate_crash_probability(house_edge, mult)
-                prob_data.append({
-                    "Multiplier": f"{mult}×",
-                    "Probability": f"{prob*100:.3f}%",
-                    "1 in": f"{int(1/prob):,}",
-                    "Payout": f"${bet_amount * mult - bet_amount:.2f}"
-                })
+            mults = np.array(multipliers)
+            succ = 1 - calculate_crash_probability(house_edge, mults)
+            odds = 1 / np.maximum(succ, 1e-300)
+            payouts = bet_amount * mults - bet_amount
             
-            st.table(pd.DataFrame(prob_data))
+            st.table(pd.DataFrame({
+                "Multiplier": [f"{m}×" for m in multipliers],
+                "Probability": [f"{p*100:.3f}%" for p in succ],
+                "1 in": [f"{int(o):,}" for o in odds],
+                "Payout": [f"${p:.2f}" for p in payouts]
+            }))
     
     # Strategy comparison
     if strategy != "Fixed Cash-out":
         st.subheader("🔄 Strategy Analysis")
         
         strategies = ["Fixed Cash-out", "Martingale", "Fibonacci", "D'Alembert"]
-        strategy_results = []
         
-        for strat in strategies:
-            strat_res = simulate_rounds(
-                num_simulations=100,
-                num_rounds=num_rounds,
-                bet_amount=bet_amount,
-                target_multiplier=target_multiplier,
-                house_edge=house_edge,
-                initial_bankroll=initial_bankroll,
-                strategy=strat
-            )
-            
-            strategy_results.append({
-                "Strategy": strat,
-                "Avg Final Balance": strat_res['final_balance'].mean(),
-                "Win Rate": (strat_res['final_balance'] > initial_bankroll).mean() * 100,
-                "Max Drawdown": strat_res['max_drawdown'].min()
-            })
+        # The selected strategy was already simulated above; only run the rest
+        other_results = cached_strategy_comparison(
+            strategies=[s for s in strategies if s != strategy],
+            num_simulations=100,
+            num_rounds=num_rounds,
+            bet_amount=bet_amount,
+            target_multiplier=target_multiplier,
+            house_edge=house_edge,
+            initial_bankroll=initial_bankroll,
+            seed=seed
+        )
+        rows = {row["Strategy"]: row for row in other_results}
+        rows[strategy] = summarize_strategy(strategy, results, initial_bankroll)
         
-        strategy_df = pd.DataFrame(strategy_results)
+        strategy_df = pd.DataFrame([rows[s] for s in strategies])
         st.dataframe(strategy_df, use_container_width=True)
     
     # Kelly Criterion information
@@ -434,33 +506,7 @@ else:
     # Quick example chart
     st.subheader("📉 Example: Probability Curve (1% House Edge)")
     
-    # Create example chart
-    multipliers = np.linspace(1, 20, 100)
-    probs = 1 - calculate_crash_probability(1.0, multipliers)
-    
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=multipliers,
-        y=probs,
-        mode='lines',
-        name='Probability',
-        line=dict(color='#667eea', width=3)
-    ))
-    
-    fig.update_layout(
-        title="Probability of Reaching Different Multipliers",
-        xaxis_title="Multiplier (×)",
-        yaxis_title="Probability",
-        hovermode="x unified",
-        template="plotly_white",
-        height=400
-    )
-    
-    fig.add_hline(y=0.5, line_dash="dash", line_color="gray",
-                  annotation_text="50% chance",
-                  annotation_position="bottom right")
-    
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(create_welcome_chart(1.0), use_container_width=True)
 
 # Footer
 st.markdown("---")
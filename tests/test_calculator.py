@@ -0,0 +1,160 @@
+"""
+Tests for the Monte Carlo simulation paths in utils.calculator
+"""
+
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from utils import calculator
+from utils.calculator import (
+    _fixed_outcomes,
+    _max_drawdown,
+    adjust_bet_for_strategy,
+    risk_of_ruin_simulation,
+    simulate_round_with_prob,
+    simulate_rounds,
+)
+
+def _loop_reference(strategy, draws, bet_amount, target_multiplier, crash_prob,
+                    initial_bankroll):
+    """
+    Replay uniform draws with the per-round Python loop.
+    """
+    num_simulations, num_rounds = draws.shape
+    final_balance = np.empty(num_simulations)
+    wins = np.empty(num_simulations, dtype=np.int64)
+    max_drawdown = np.empty(num_simulations)
+    path = np.empty(num_rounds)
+
+    for sim in range(num_simulations):
+        bankroll = initial_bankroll
+        sim_wins = 0
+
+        for round_num in range(num_rounds):
+            current_bet = adjust_bet_for_strategy(
+                strategy, bet_amount, bankroll, sim_wins, round_num
+            )
+            bankroll, won = simulate_round_with_prob(
+                current_bet, target_multiplier, crash_prob, bankroll,
+                draws[sim, round_num]
+            )
+            if won:
+                sim_wins += 1
+            path[round_num] = bankroll
+
+        final_balance[sim] = bankroll
+        wins[sim] = sim_wins
+        max_drawdown[sim] = _max_drawdown(path, initial_bankroll)
+
+    return final_balance, wins, max_drawdown
+
+def _fixed_reference(wins_mask, bet_amount, target_multiplier, initial_bankroll):
+    """
+    Replay Fixed Cash-out outcomes with the per-round loop.
+    """
+    # u = 1 always beats crash_prob = 0.5, u = 0 never does
+    return _loop_reference(
+        "Fixed Cash-out", wins_mask.astype(np.float64), bet_amount,
+        target_multiplier, 0.5, initial_bankroll
+    )
+
+class FixedCashOutTest(unittest.TestCase):
+
+    CASES = [
+        # (bet_amount, target_multiplier, initial_bankroll, win probability)
+        (10, 2.0, 1000, 0.5),
+        (30, 1.5, 100, 0.67),
+        (5000, 2.0, 1000, 0.5),
+        (13.7, 3.3, 250, 0.3),
+        (100, 1.1, 100, 0.9),
+    ]
+
+    def test_matches_per_round_loop(self):
+        self._check_cases()
+
+    def test_numpy_replay_matches_per_round_loop(self):
+        with mock.patch.object(calculator, 'replay_fixed_rows', None):
+            self._check_cases()
+
+    def _check_cases(self):
+        rng = np.random.default_rng(0)
+        for bet, mult, bankroll, p_win in self.CASES:
+            with self.subTest(bet=bet, mult=mult, bankroll=bankroll):
+                wins_mask = rng.random((200, 300)) < p_win
+                expected = _fixed_reference(wins_mask, bet, mult, bankroll)
+                actual = _fixed_outcomes(wins_mask, bet, mult, bankroll)
+                for exp, act in zip(expected, actual):
+                    np.testing.assert_allclose(act, exp, rtol=1e-9, atol=1e-9)
+
+    def test_final_balance_is_exact_for_fractional_stakes(self):
+        bet, mult, bankroll, rounds = 13.7, 1.73, 100000, 10000
+        results = simulate_rounds(50, rounds, bet, mult, 1.0, bankroll, seed=2)
+        wins = results['total_wins'].to_numpy()
+        expected = bankroll + wins * (bet * (mult - 1)) - (rounds - wins) * bet
+        np.testing.assert_allclose(results['final_balance'], expected, rtol=0, atol=1e-6)
+
+    def test_integer_inputs(self):
+        for bankroll in (1000, 1000.5, 15):
+            with self.subTest(bankroll=bankroll):
+                results = simulate_rounds(10, 10, 10, 2, 1.0, bankroll, seed=3)
+                self.assertEqual(results['final_balance'].dtype, np.float64)
+                wins_mask = np.random.default_rng(3).random((10, 10)) < 0.5
+                expected = _fixed_reference(wins_mask, 10, 2, bankroll)
+                actual = _fixed_outcomes(wins_mask, 10, 2, bankroll)
+                for exp, act in zip(expected, actual):
+                    np.testing.assert_allclose(act, exp, rtol=1e-9, atol=1e-9)
+
+    def test_stake_above_bankroll_goes_all_in(self):
+        results = simulate_rounds(1000, 50, 5000, 2.0, 1.0, 1000, seed=1)
+        ruined = (results['final_balance'] == 0).mean()
+        self.assertGreater(ruined, 0.9)
+        self.assertGreater(results['total_wins'].mean(), 0)
+
+class RiskOfRuinTest(unittest.TestCase):
+
+    def test_chunking_does_not_change_result(self):
+        args = (100, 30, 1.5, 2.0, 200, 500)
+        expected = risk_of_ruin_simulation(*args, seed=7)
+        # Several rows per chunk, then a single row per chunk
+        for chunk_bytes in (200 * 8 * 7, 1):
+            with self.subTest(chunk_bytes=chunk_bytes):
+                with mock.patch.object(calculator, '_FIXED_CHUNK_BYTES', chunk_bytes):
+                    self.assertEqual(risk_of_ruin_simulation(*args, seed=7), expected)
+        self.assertGreater(expected, 0)
+
+@unittest.skipUnless(calculator.STRATEGY_KERNELS, "numba is not installed")
+class StrategyKernelTest(unittest.TestCase):
+
+    CASES = [
+        # (bet_amount, target_multiplier, initial_bankroll, crash_prob)
+        (10, 2.0, 1000, 0.495),
+        (25, 1.5, 300, 0.33),
+        (13.7, 3.3, 250, 0.69),
+        # Large enough that the Martingale doubling cap binds before the bankroll
+        (1, 2.0, 1e9, 0.3),
+    ]
+
+    def test_kernels_match_per_round_loop(self):
+        num_simulations, num_rounds, seed = 50, 200, 1234
+        for strategy, kernel in calculator.STRATEGY_KERNELS.items():
+            for bet, mult, bankroll, crash_prob in self.CASES:
+                with self.subTest(strategy=strategy, bet=bet, mult=mult):
+                    # Kernels seed the legacy generator with seed + s per run
+                    draws = np.array([
+                        np.random.RandomState(seed + s).random_sample(num_rounds)
+                        for s in range(num_simulations)
+                    ])
+                    expected = _loop_reference(
+                        strategy, draws, bet, mult, crash_prob, bankroll
+                    )
+                    actual = kernel(
+                        num_simulations, num_rounds, float(bet), float(mult),
+                        crash_prob, float(bankroll), seed
+                    )
+                    for exp, act in zip(expected, actual):
+                        np.testing.assert_allclose(act, exp, rtol=1e-9, atol=1e-9)
+
+if __name__ == '__main__':
+    unittest.main()
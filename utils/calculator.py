@@ -4,10 +4,29 @@ Core mathematical calculations for Aviator probability analysis
 
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from scipy import stats
+from utils.strategy_constants import FIB_SEQUENCE, MARTINGALE_MAX_DOUBLINGS
 
-def calculate_crash_probability(house_edge: float, multiplier: float) -> float:
+try:
+    from utils.calculator_nb import STRATEGY_KERNELS, replay_fixed_rows
+except ImportError:  # numba not installed, fall back to the Python loop
+    STRATEGY_KERNELS = {}
+    replay_fixed_rows = None
+
+# Shared generator for unseeded draws
+_rng = np.random.default_rng()
+
+def _get_rng(seed: Optional[int]) -> np.random.Generator:
+    """
+    Return a fresh generator for an explicit seed, else the shared one.
+    """
+    return _rng if seed is None else np.random.default_rng(seed)
+
+def calculate_crash_probability(
+    house_edge: float,
+    multiplier: Union[float, np.ndarray]
+) -> Union[float, np.ndarray]:
     """
     Calculate probability of crash before reaching target multiplier.
     
@@ -16,10 +35,11 @@ def calculate_crash_probability(house_edge: float, multiplier: float) -> float:
     
     Args:
         house_edge: House edge percentage (e.g., 1.0 for 1%)
-        multiplier: Target multiplier
+        multiplier: Target multiplier, or an array of multipliers
     
     Returns:
-        Probability of crashing before reaching multiplier
+        Probability of crashing before reaching multiplier (same shape as
+        multiplier)
     """
     # Ensure house_edge is between 0.1 and 10
     house_edge = max(0.1, min(house_edge, 10.0))
@@ -28,10 +48,14 @@ def calculate_crash_probability(house_edge: float, multiplier: float) -> float:
     house_edge_decimal = house_edge / 100
     k = 1 - (house_edge_decimal / np.log(2))
     
-    # Calculate crash probability
-    if multiplier <= 1:
-        return 0.0
-    return 1 - (multiplier ** (-k))
+    # Calculate crash probability (zero at or below 1x); the power is only
+    # evaluated above 1x so non-positive multipliers raise no warnings
+    m = np.asarray(multiplier, dtype=np.float64)
+    above = m > 1.0
+    crash_prob = np.ones_like(m)
+    np.power(m, -k, out=crash_prob, where=above)
+    np.subtract(1.0, crash_prob, out=crash_prob)
+    return crash_prob if crash_prob.ndim else float(crash_prob)
 
 def simulate_round(
     bet_amount: float,
@@ -42,16 +66,37 @@ def simulate_round(
     """
     Simulate a single round of the game.
     
+    Returns:
+        Tuple of (new_bankroll, won)
+    """
+    crash_prob = calculate_crash_probability(house_edge, target_multiplier)
+    return simulate_round_with_prob(
+        bet_amount, target_multiplier, crash_prob, current_bankroll
+    )
+
+def simulate_round_with_prob(
+    bet_amount: float,
+    target_multiplier: float,
+    crash_prob: float,
+    current_bankroll: float,
+    u: Optional[float] = None
+) -> Tuple[float, bool]:
+    """
+    Simulate a single round with a precomputed crash probability.
+    
+    Args:
+        u: Pre-drawn uniform sample for the outcome (drawn here if None)
+    
     Returns:
         Tuple of (new_bankroll, won)
     """
     if current_bankroll < bet_amount:
         return current_bankroll, False
     
-    crash_prob = calculate_crash_probability(house_edge, target_multiplier)
-    
     # Generate random outcome
-    if np.random.random() > crash_prob:
+    if u is None:
+        u = _rng.random()
+    if u > crash_prob:
         # Win
         win_amount = bet_amount * (target_multiplier - 1)
         return current_bankroll + win_amount, True
@@ -66,53 +111,299 @@ def simulate_rounds(
     target_multiplier: float,
     house_edge: float,
     initial_bankroll: float,
-    strategy: str = "Fixed Cash-out"
+    strategy: str = "Fixed Cash-out",
+    seed: Optional[int] = None
 ) -> pd.DataFrame:
     """
     Run Monte Carlo simulation for multiple rounds.
     
+    Args:
+        seed: Seed for the random generator; the same seed and parameters
+            reproduce the same results
+    
     Returns:
         DataFrame with simulation results
     """
-    results = []
+    rng = _get_rng(seed)
+    
+    if strategy == "Fixed Cash-out":
+        return _simulate_fixed_rounds(
+            num_simulations, num_rounds, bet_amount,
+            target_multiplier, house_edge, initial_bankroll, rng
+        )
+    
+    crash_prob = calculate_crash_probability(house_edge, target_multiplier)
+    
+    kernel = STRATEGY_KERNELS.get(strategy)
+    if kernel is not None:
+        # Kernels reseed per simulation from this base seed
+        kernel_seed = int(rng.integers(0, 2**32 - num_simulations))
+        final_balance, wins, max_drawdown = kernel(
+            num_simulations, num_rounds, float(bet_amount),
+            float(target_multiplier), crash_prob, float(initial_bankroll),
+            kernel_seed
+        )
+        return _results_frame(
+            final_balance, wins, max_drawdown, num_rounds, initial_bankroll
+        )
+    
+    final_balance = np.empty(num_simulations)
+    wins = np.empty(num_simulations, dtype=np.int64)
+    max_drawdown = np.empty(num_simulations)
+    path = np.empty(num_rounds)
+    
+    # Unknown strategies bet the base amount, as in adjust_bet_for_strategy
+    adjust = _STRATEGIES.get(strategy, _fixed_bet)
     
     for sim in range(num_simulations):
         bankroll = initial_bankroll
-        max_bankroll = initial_bankroll
-        min_bankroll = initial_bankroll
-        wins = 0
+        sim_wins = 0
+        draws = rng.random(num_rounds)
         
         for round_num in range(num_rounds):
             # Adjust bet based on strategy
-            current_bet = adjust_bet_for_strategy(
-                strategy, bet_amount, bankroll, wins, round_num
-            )
+            if bankroll <= 0:
+                current_bet = 0
+            else:
+                current_bet = adjust(bet_amount, bankroll, sim_wins, round_num)
             
             # Simulate round
-            bankroll, won = simulate_round(
-                current_bet, target_multiplier, house_edge, bankroll
+            bankroll, won = simulate_round_with_prob(
+                current_bet, target_multiplier, crash_prob, bankroll,
+                draws[round_num]
             )
             
             if won:
-                wins += 1
+                sim_wins += 1
             
-            # Track max/min bankroll for drawdown calculation
-            max_bankroll = max(max_bankroll, bankroll)
-            min_bankroll = min(min_bankroll, bankroll)
+            # Record the bankroll path for the drawdown calculation
+            path[round_num] = bankroll
         
-        # Calculate statistics for this simulation
-        results.append({
-            'simulation': sim + 1,
-            'final_balance': bankroll,
-            'total_wins': wins,
-            'total_losses': num_rounds - wins,
-            'win_rate': wins / num_rounds,
-            'net_profit': bankroll - initial_bankroll,
-            'max_drawdown': min_bankroll - max_bankroll,
-            'roi': ((bankroll - initial_bankroll) / initial_bankroll) * 100
-        })
+        final_balance[sim] = bankroll
+        wins[sim] = sim_wins
+        max_drawdown[sim] = _max_drawdown(path, initial_bankroll)
+    
+    return _results_frame(
+        final_balance, wins, max_drawdown, num_rounds, initial_bankroll
+    )
+
+# Target size of one float64 trajectory chunk in the vectorized simulations
+_FIXED_CHUNK_BYTES = 1 << 20
+
+def _simulate_fixed_rounds(
+    num_simulations: int,
+    num_rounds: int,
+    bet_amount: float,
+    target_multiplier: float,
+    house_edge: float,
+    initial_bankroll: float,
+    rng: np.random.Generator
+) -> pd.DataFrame:
+    """
+    Vectorized Monte Carlo for the Fixed Cash-out strategy.
+    
+    Every round is an independent draw with a constant stake, so outcomes
+    are drawn as (simulations, rounds) arrays and the bankroll trajectories
+    are built with a cumulative sum. Runs whose bankroll drops below the
+    stake bet min(bet_amount, bankroll), as in adjust_bet_for_strategy, and
+    are replayed round by round. Simulations are processed in row chunks of
+    about _FIXED_CHUNK_BYTES so the working set stays cache-resident.
+    
+    Returns:
+        DataFrame with simulation results
+    """
+    crash_prob = calculate_crash_probability(house_edge, target_multiplier)
+    
+    final_balance = np.empty(num_simulations)
+    wins = np.empty(num_simulations, dtype=np.int64)
+    max_drawdown = np.empty(num_simulations)
     
-    return pd.DataFrame(results)
+    chunk = max(1, _FIXED_CHUNK_BYTES // (num_rounds * 8))
+    for start in range(0, num_simulations, chunk):
+        rows = slice(start, min(start + chunk, num_simulations))
+        final_balance[rows], wins[rows], max_drawdown[rows] = _simulate_fixed_chunk(
+            rows.stop - rows.start, num_rounds, bet_amount,
+            target_multiplier, crash_prob, initial_bankroll, rng
+        )
+    
+    return _results_frame(
+        final_balance, wins, max_drawdown, num_rounds, initial_bankroll
+    )
+
+def _simulate_fixed_chunk(
+    num_simulations: int,
+    num_rounds: int,
+    bet_amount: float,
+    target_multiplier: float,
+    crash_prob: float,
+    initial_bankroll: float,
+    rng: np.random.Generator
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Simulate one chunk of Fixed Cash-out runs.
+    
+    Returns:
+        Tuple of (final_balance, wins, max_drawdown) arrays
+    """
+    # Only the outcome draws are float32; balances are computed in float64
+    u = rng.random((num_simulations, num_rounds), dtype=np.float32)
+    wins_mask = u > np.float32(crash_prob)
+    del u
+    
+    return _fixed_outcomes(wins_mask, bet_amount, target_multiplier, initial_bankroll)
+
+def _fixed_outcomes(
+    wins_mask: np.ndarray,
+    bet_amount: float,
+    target_multiplier: float,
+    initial_bankroll: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Play Fixed Cash-out runs from a (simulations, rounds) array of outcomes.
+    
+    Each round stakes min(bet_amount, bankroll), as in the per-round loop.
+    
+    Returns:
+        Tuple of (final_balance, wins, max_drawdown) arrays
+    """
+    win_delta = bet_amount * (target_multiplier - 1)
+    loss_delta = -bet_amount
+    
+    pnl = np.where(wins_mask, float(win_delta), float(loss_delta))
+    traj = np.cumsum(pnl, axis=1)
+    traj += initial_bankroll
+    del pnl
+    
+    # Runs that always cover the stake played every round at the base bet;
+    # the rest are replayed, betting whatever bankroll is left
+    if initial_bankroll < bet_amount:
+        short_rows = np.arange(traj.shape[0])
+    else:
+        short_rows = np.flatnonzero(traj[:, :-1].min(axis=1, initial=np.inf) < bet_amount)
+    if short_rows.size and replay_fixed_rows is not None:
+        replay_fixed_rows(
+            traj, wins_mask, short_rows, float(bet_amount),
+            float(target_multiplier), float(initial_bankroll)
+        )
+    elif short_rows.size:
+        # Replay from the first round any of them fell short, vectorized
+        # across those runs
+        if initial_bankroll < bet_amount:
+            start = 0
+        else:
+            covered = traj[short_rows, :-1] >= bet_amount
+            start = int(np.argmin(covered, axis=1).min()) + 1
+        bankroll = (np.full(short_rows.size, float(initial_bankroll)) if start == 0
+                    else traj[short_rows, start - 1])
+        outcomes = wins_mask[short_rows]
+        path = traj[short_rows]
+        for t in range(start, path.shape[1]):
+            stake = np.minimum(bankroll, bet_amount)
+            bankroll += np.where(outcomes[:, t], stake * (target_multiplier - 1), -stake)
+            path[:, t] = bankroll
+            if not bankroll.any():
+                # Every replayed run is ruined and stays at zero
+                path[:, t:] = 0.0
+                break
+        traj[short_rows] = path
+    
+    # Every round is drawn, so wins on a zero stake after ruin still count
+    wins = np.count_nonzero(wins_mask, axis=1)
+    
+    # Runs played entirely at the base bet get their final balance from the
+    # win/loss counts rather than the accumulated sum
+    final_balance = initial_bankroll + wins * win_delta + (wins_mask.shape[1] - wins) * loss_delta
+    final_balance[short_rows] = traj[short_rows, -1]
+    
+    return final_balance, wins, _max_drawdown(traj, initial_bankroll)
+
+def _max_drawdown(traj: np.ndarray, initial_bankroll: float) -> np.ndarray:
+    """
+    Largest peak-to-trough drop along the last axis of bankroll paths.
+    
+    The initial bankroll counts as the first peak. Drawdowns are returned
+    as non-positive amounts.
+    """
+    running_max = np.maximum.accumulate(traj, axis=-1)
+    np.maximum(running_max, initial_bankroll, out=running_max)
+    return (traj - running_max).min(axis=-1)
+
+def _results_frame(
+    final_balance: np.ndarray,
+    wins: np.ndarray,
+    max_drawdown: np.ndarray,
+    num_rounds: int,
+    initial_bankroll: float
+) -> pd.DataFrame:
+    """
+    Build the simulation results DataFrame from per-simulation arrays.
+    """
+    num_simulations = len(final_balance)
+    
+    return pd.DataFrame({
+        'simulation': np.arange(1, num_simulations + 1),
+        'final_balance': final_balance,
+        'total_wins': wins,
+        'total_losses': num_rounds - wins,
+        'win_rate': wins / num_rounds,
+        'net_profit': final_balance - initial_bankroll,
+        'max_drawdown': max_drawdown,
+        'roi': ((final_balance - initial_bankroll) / initial_bankroll) * 100
+    })
+
+def summarize_strategy(
+    strategy: str,
+    results: pd.DataFrame,
+    initial_bankroll: float
+) -> Dict[str, float]:
+    """
+    Summarize simulate_rounds results for the strategy comparison table.
+    
+    Returns:
+        Dictionary with strategy name, average final balance, win rate and
+        maximum drawdown
+    """
+    return {
+        "Strategy": strategy,
+        "Avg Final Balance": results['final_balance'].mean(),
+        "Win Rate": (results['final_balance'] > initial_bankroll).mean() * 100,
+        "Max Drawdown": results['max_drawdown'].min()
+    }
+
+def _fixed_bet(base_bet: float, bankroll: float, wins: int, round_num: int) -> float:
+    return base_bet if base_bet < bankroll else bankroll
+
+def _martingale_bet(base_bet: float, bankroll: float, wins: int, round_num: int) -> float:
+    # Double after loss
+    if round_num == 0:
+        return base_bet if base_bet < bankroll else bankroll
+    
+    # This is simplified - in reality you'd track last outcome.
+    # The exponent is capped so the stake stays a float-sized number.
+    raw = base_bet * (2 ** min(wins, MARTINGALE_MAX_DOUBLINGS))
+    return raw if raw < bankroll else bankroll
+
+def _fibonacci_bet(base_bet: float, bankroll: float, wins: int, round_num: int) -> float:
+    # Fibonacci sequence betting
+    idx = min(wins % 10, len(FIB_SEQUENCE) - 1)
+    raw = base_bet * FIB_SEQUENCE[idx]
+    return raw if raw < bankroll else bankroll
+
+def _dalembert_bet(base_bet: float, bankroll: float, wins: int, round_num: int) -> float:
+    # Increase by base bet after loss, decrease after win
+    adjustment = (wins - (round_num - wins)) * base_bet
+    raw = base_bet + adjustment
+    floor = base_bet * 0.1
+    if raw < floor:
+        raw = floor
+    return raw if raw < bankroll else bankroll
+
+_STRATEGIES = {
+    "Fixed Cash-out": _fixed_bet,
+    "Martingale": _martingale_bet,
+    "Fibonacci": _fibonacci_bet,
+    "D'Alembert": _dalembert_bet,
+}
 
 def adjust_bet_for_strategy(
     strategy: str,
@@ -137,29 +428,8 @@ def adjust_bet_for_strategy(
     if bankroll <= 0:
         return 0
     
-    if strategy == "Fixed Cash-out":
-        return min(base_bet, bankroll)
-    
-    elif strategy == "Martingale":
-        # Double after loss
-        if round_num == 0:
-            return min(base_bet, bankroll)
-        
-        # This is simplified - in reality you'd track last outcome
-        return min(base_bet * (2 ** wins), bankroll)
-    
-    elif strategy == "Fibonacci":
-        # Fibonacci sequence betting
-        fib_sequence = [1, 1, 2, 3, 5, 8, 13, 21, 34, 55]
-        idx = min(wins % 10, len(fib_sequence) - 1)
-        return min(base_bet * fib_sequence[idx], bankroll)
-    
-    elif strategy == "D'Alembert":
-        # Increase by base bet after loss, decrease after win
-        adjustment = (wins - (round_num - wins)) * base_bet
-        return min(max(base_bet + adjustment, base_bet * 0.1), bankroll)
-    
-    return min(base_bet, bankroll)
+    adjust = _STRATEGIES.get(strategy, _fixed_bet)
+    return adjust(base_bet, bankroll, wins, round_num)
 
 def calculate_expected_value(
     bet_amount: float,
@@ -212,36 +482,35 @@ def risk_of_ruin_simulation(
     target_multiplier: float,
     house_edge: float,
     num_rounds: int,
-    num_simulations: int = 1000
+    num_simulations: int = 1000,
+    seed: Optional[int] = None
 ) -> float:
     """
     Calculate risk of ruin using Monte Carlo simulation.
     
+    Args:
+        seed: Seed for the random generator
+    
     Returns:
         Percentage chance of losing entire bankroll
     """
-    ruins = 0
+    crash_prob = calculate_crash_probability(house_edge, target_multiplier)
+    win_delta = bet_amount * (target_multiplier - 1)
+    loss_delta = -bet_amount
     
-    for _ in range(num_simulations):
-        bankroll = initial_bankroll
-        crashed = False
-        
-        for _ in range(num_rounds):
-            if bankroll <= 0:
-                crashed = True
-                break
-            
-            crash_prob = calculate_crash_probability(house_edge, target_multiplier)
-            
-            if np.random.random() > crash_prob:
-                bankroll += bet_amount * (target_multiplier - 1)
-            else:
-                bankroll -= bet_amount
-        
-        if bankroll <= 0:
-            ruins += 1
+    # A run is ruined as soon as its bankroll touches zero; rows are
+    # processed in chunks of about _FIXED_CHUNK_BYTES to bound peak memory
+    rng = _get_rng(seed)
+    ruined = np.empty(num_simulations, dtype=bool)
+    chunk = max(1, _FIXED_CHUNK_BYTES // (num_rounds * 8))
+    for start in range(0, num_simulations, chunk):
+        rows = slice(start, min(start + chunk, num_simulations))
+        wins_mask = rng.random((rows.stop - rows.start, num_rounds)) > crash_prob
+        traj = np.where(wins_mask, float(win_delta), float(loss_delta)).cumsum(axis=1)
+        traj += initial_bankroll
+        ruined[rows] = (traj <= 0).any(axis=1)
     
-    return (ruins / num_simulations) * 100
+    return ruined.mean() * 100
 
 def calculate_probability_table(
     house_edge: float,
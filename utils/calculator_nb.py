@@ -0,0 +1,178 @@
+"""
+Numba-compiled Monte Carlo kernels for path-dependent betting strategies
+"""
+
+from functools import partial
+
+import numpy as np
+from numba import njit
+
+from utils.strategy_constants import FIB_SEQUENCE, MARTINGALE_MAX_DOUBLINGS
+
+@njit(fastmath=True, cache=True)
+def _sim_martingale(N, T, bet, mult, crash_prob, bankroll0, seed, max_doublings):
+    """
+    Simulate N runs of T rounds betting base * 2^wins (exponent capped).
+
+    Returns:
+        Tuple of (final_balance, wins, max_drawdown) arrays
+    """
+    final_balance = np.empty(N, dtype=np.float64)
+    wins_out = np.empty(N, dtype=np.int64)
+    max_drawdown = np.empty(N, dtype=np.float64)
+
+    for s in range(N):
+        # Seed per simulation so each run is reproducible from the base seed
+        np.random.seed(seed + s)
+        bankroll = bankroll0
+        peak = bankroll0
+        drawdown = 0.0
+        wins = 0
+
+        for t in range(T):
+            if bankroll <= 0:
+                current_bet = 0.0
+            else:
+                raw = bet * 2.0 ** min(wins, max_doublings)
+                current_bet = raw if raw < bankroll else bankroll
+
+            if np.random.random() > crash_prob:
+                bankroll += current_bet * (mult - 1)
+                wins += 1
+            else:
+                bankroll -= current_bet
+
+            # Peak-to-trough drawdown against the running maximum
+            if bankroll > peak:
+                peak = bankroll
+            elif bankroll - peak < drawdown:
+                drawdown = bankroll - peak
+
+        final_balance[s] = bankroll
+        wins_out[s] = wins
+        max_drawdown[s] = drawdown
+
+    return final_balance, wins_out, max_drawdown
+
+@njit(fastmath=True, cache=True)
+def _sim_fib(N, T, bet, mult, crash_prob, bankroll0, seed, fib):
+    """
+    Simulate N runs of T rounds betting along the Fibonacci sequence.
+
+    Returns:
+        Tuple of (final_balance, wins, max_drawdown) arrays
+    """
+    final_balance = np.empty(N, dtype=np.float64)
+    wins_out = np.empty(N, dtype=np.int64)
+    max_drawdown = np.empty(N, dtype=np.float64)
+
+    for s in range(N):
+        # Seed per simulation so each run is reproducible from the base seed
+        np.random.seed(seed + s)
+        bankroll = bankroll0
+        peak = bankroll0
+        drawdown = 0.0
+        wins = 0
+
+        for t in range(T):
+            if bankroll <= 0:
+                current_bet = 0.0
+            else:
+                raw = bet * fib[min(wins % 10, fib.shape[0] - 1)]
+                current_bet = raw if raw < bankroll else bankroll
+
+            if np.random.random() > crash_prob:
+                bankroll += current_bet * (mult - 1)
+                wins += 1
+            else:
+                bankroll -= current_bet
+
+            # Peak-to-trough drawdown against the running maximum
+            if bankroll > peak:
+                peak = bankroll
+            elif bankroll - peak < drawdown:
+                drawdown = bankroll - peak
+
+        final_balance[s] = bankroll
+        wins_out[s] = wins
+        max_drawdown[s] = drawdown
+
+    return final_balance, wins_out, max_drawdown
+
+@njit(fastmath=True, cache=True)
+def _sim_dalembert(N, T, bet, mult, crash_prob, bankroll0, seed):
+    """
+    Simulate N runs of T rounds adjusting the bet by one unit per net win/loss.
+
+    Returns:
+        Tuple of (final_balance, wins, max_drawdown) arrays
+    """
+    final_balance = np.empty(N, dtype=np.float64)
+    wins_out = np.empty(N, dtype=np.int64)
+    max_drawdown = np.empty(N, dtype=np.float64)
+
+    for s in range(N):
+        # Seed per simulation so each run is reproducible from the base seed
+        np.random.seed(seed + s)
+        bankroll = bankroll0
+        peak = bankroll0
+        drawdown = 0.0
+        wins = 0
+
+        for t in range(T):
+            if bankroll <= 0:
+                current_bet = 0.0
+            else:
+                adjustment = (wins - (t - wins)) * bet
+                raw = bet + adjustment
+                if raw < bet * 0.1:
+                    raw = bet * 0.1
+                current_bet = raw if raw < bankroll else bankroll
+
+            if np.random.random() > crash_prob:
+                bankroll += current_bet * (mult - 1)
+                wins += 1
+            else:
+                bankroll -= current_bet
+
+            # Peak-to-trough drawdown against the running maximum
+            if bankroll > peak:
+                peak = bankroll
+            elif bankroll - peak < drawdown:
+                drawdown = bankroll - peak
+
+        final_balance[s] = bankroll
+        wins_out[s] = wins
+        max_drawdown[s] = drawdown
+
+    return final_balance, wins_out, max_drawdown
+
+@njit(fastmath=True, cache=True)
+def replay_fixed_rows(traj, outcomes, rows, bet, mult, bankroll0):
+    """
+    Replay selected Fixed Cash-out runs in place, staking min(bet, bankroll).
+    
+    traj and outcomes are (simulations, rounds) arrays; only the listed
+    rows of traj are rewritten.
+    """
+    T = traj.shape[1]
+    
+    for i in range(rows.shape[0]):
+        r = rows[i]
+        bankroll = bankroll0
+        
+        for t in range(T):
+            current_bet = bet if bet < bankroll else bankroll
+            if outcomes[r, t]:
+                bankroll += current_bet * (mult - 1)
+            else:
+                bankroll -= current_bet
+            traj[r, t] = bankroll
+
+# The shared constants are bound as arguments rather than read as globals:
+# Numba freezes globals into its on-disk cache and would not notice them change
+STRATEGY_KERNELS = {
+    "Martingale": partial(_sim_martingale, max_doublings=MARTINGALE_MAX_DOUBLINGS),
+    "Fibonacci": partial(_sim_fib, fib=np.array(FIB_SEQUENCE, dtype=np.int64)),
+    "D'Alembert": _sim_dalembert,
+}
@@ -0,0 +1,9 @@
+"""
+Bet-sizing constants shared by the Python strategies and the Numba kernels
+"""
+
+# Stake multiples for the Fibonacci strategy, indexed by wins % 10
+FIB_SEQUENCE = (1, 1, 2, 3, 5, 8, 13, 21, 34, 55)
+
+# Cap on the Martingale exponent so the stake stays a float-sized number
+MARTINGALE_MAX_DOUBLINGS = 20
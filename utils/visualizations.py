@@ -2,169 +2,345 @@
 Visualization functions for Aviator probability calculator
 """
 
+import functools
+import math
+
 import plotly.graph_objects as go
 import plotly.express as px
 import numpy as np
 import pandas as pd
 from plotly.subplots import make_subplots
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple, Union
+from utils.calculator import calculate_crash_probability
+
+# Crash model exponent is k = 1 - (house_edge / 100) / ln 2
+_LN2 = math.log(2.0)
+
+# Outcome bucket colors, from heavy loss (red) to large profit (green)
+_OUTCOME_COLORS = ('#e53e3e', '#dd6b20', '#d69e2e', '#ecc94b',
+                   '#9ae6b4', '#68d391', '#38a169', '#2f855a')
+
+# Strategy comparison colors for balance, win rate and drawdown
+_METRIC_COLORS = ('#667eea', '#38a169', '#e53e3e')
+
+def _line(
+    y: np.ndarray,
+    color: str,
+    name: str,
+    width: int = 3,
+    x: Optional[np.ndarray] = None,
+    template: Optional[str] = None,
+    **kw
+) -> Dict:
+    """
+    Build a scattergl line trace as a plain dict.
+    
+    Extra keyword arguments (axis refs, fill, ...) are added to the trace.
+    """
+    return {
+        'type': 'scattergl',
+        'x': x,
+        'y': y,
+        'mode': 'lines',
+        'name': name,
+        'line': {'color': color, 'width': width},
+        'hovertemplate': template,
+        **kw
+    }
 
 def create_probability_chart(house_edge: float) -> go.Figure:
     """
     Create probability distribution chart.
+    
+    Figures are memoized per house edge, so callers must not mutate the
+    returned figure.
     """
-    # Generate multiplier range
-    multipliers = np.linspace(1, 100, 200)
+    return _probability_chart(round(house_edge, 4))
+
+@functools.lru_cache(maxsize=32)
+def _probability_chart(house_edge: float) -> go.Figure:
+    # Generate multiplier range, log-spaced to resolve the knee near 1x;
+    # float32 is ample for plotting and halves the payload sent to the browser
+    multipliers = np.geomspace(1.0, 100.0, 80, dtype=np.float32)
+    
+    # Calculate probabilities (a float32 exponent keeps every curve float32)
+    exponent = np.float32((house_edge * 0.01) / _LN2 - 1.0)
+    crash_probs = 1.0 - np.power(multipliers, exponent)
+    success_probs = 1.0 - crash_probs
+    
+    # Add reference lines where success probability crosses each threshold
+    # crash_probs increases with the multiplier, so binary search finds the
+    # crossing; then step back if the left neighbour is the nearer point
+    thresholds = np.array([0.5, 0.25, 0.1, 0.01])
+    targets = 1.0 - thresholds
+    idxs = np.searchsorted(crash_probs, targets)
+    idxs = np.clip(idxs, 1, len(multipliers) - 1)
+    idxs -= (targets - crash_probs[idxs - 1]) < (crash_probs[idxs] - targets)
+    x_vals = multipliers[idxs]
+    
+    shapes = [
+        dict(type='line', xref='x', yref='y domain', x0=x, x1=x, y0=0, y1=1,
+             line=dict(dash='dash', color='gray'), opacity=0.5)
+        for x in x_vals
+    ]
+    annotations = [
+        # Annotation positions on a log axis are given as log10(x)
+        dict(xref='x', yref='y', x=np.log10(x), y=threshold, text=f"{x:.1f}×",
+             showarrow=False, yshift=10)
+        for x, threshold in zip(x_vals, thresholds)
+    ]
+    
+    # 2x2 grid with 0.15 spacing between panels
+    left, right = [0.0, 0.425], [0.575, 1.0]
+    top, bottom = [0.575, 1.0], [0.0, 0.425]
+    
+    # Subplot titles centred above each panel, as make_subplots places them
+    titles = [
+        ("Success Probability", left, top),
+        ("Crash Probability", right, top),
+        ("Probability Density", left, bottom),
+        ("Expected Value", right, bottom),
+    ]
+    annotations = [
+        dict(text=text, x=(x_domain[0] + x_domain[1]) / 2, y=y_domain[1],
+             xref='paper', yref='paper', xanchor='center', yanchor='bottom',
+             showarrow=False, font=dict(size=16))
+        for text, x_domain, y_domain in titles
+    ] + annotations
+    
+    # Probability density: d/dm (1 - m^exponent) = -exponent * m^(exponent - 1)
+    pdf = -exponent * np.power(multipliers, exponent - 1.0)
+    
+    # Expected value per $1 bet, as in calculate_expected_value
+    expected_value = multipliers * success_probs - 1.0
+    
+    data = [
+        _line(success_probs, '#38a169', 'Success', x=multipliers, xaxis='x', yaxis='y',
+              template='<b>%{x:.2f}×</b><br>Success: %{y:.1%}<extra></extra>'),
+        _line(crash_probs, '#e53e3e', 'Crash', x=multipliers, xaxis='x2', yaxis='y2',
+              template='<b>%{x:.2f}×</b><br>Crash: %{y:.1%}<extra></extra>'),
+        _line(pdf, '#667eea', 'Density', width=2, x=multipliers, xaxis='x3', yaxis='y3',
+              template='<b>%{x:.2f}×</b><br>Density: %{y:.4f}<extra></extra>',
+              fill='tozeroy', fillcolor='rgba(102, 126, 234, 0.1)'),
+        _line(expected_value, '#764ba2', 'Expected Value', x=multipliers, xaxis='x4', yaxis='y4',
+              template='<b>%{x:.2f}×</b><br>EV per $1: %{y:+.3f}<extra></extra>'),
+    ]
+    
+    multiplier_title = dict(text="Multiplier (×)")
+    layout = dict(
+        xaxis=dict(anchor='y', domain=left, type='log', title=multiplier_title),
+        yaxis=dict(anchor='x', domain=top, title=dict(text="Probability"), tickformat=".0%"),
+        xaxis2=dict(anchor='y2', domain=right, type='log', title=multiplier_title),
+        yaxis2=dict(anchor='x2', domain=top, title=dict(text="Probability"), tickformat=".0%"),
+        xaxis3=dict(anchor='y3', domain=left, type='log', title=multiplier_title),
+        yaxis3=dict(anchor='x3', domain=bottom, title=dict(text="Density")),
+        xaxis4=dict(anchor='y4', domain=right, type='log', title=multiplier_title),
+        yaxis4=dict(anchor='x4', domain=bottom, title=dict(text="EV per $1 Bet")),
+        annotations=annotations,
+        shapes=shapes,
+        height=700,
+        showlegend=False,
+        template="plotly_white",
+        title=dict(text=f"Probability Analysis (House Edge: {house_edge}%)", x=0.5)
+    )
     
-    # Calculate probabilities
-    crash_probs = []
-    for mult in multipliers:
-        crash_prob = 1 - (mult ** (-(1 - (house_edge/100)/np.log(2))))
-        crash_probs.append(crash_prob)
+    # Build the whole figure in one validated constructor call instead of
+    # separate add_trace/update_layout/update_axes passes
+    fig = go.Figure(dict(data=data, layout=layout))
     
-    success_probs = 1 - np.array(crash_probs)
+    return fig
+
+def create_welcome_chart(house_edge: float) -> go.Figure:
+    """
+    Create the example probability curve shown on the welcome screen.
     
-    # Create figure
-    fig = make_subplots(
-        rows=2, cols=2,
-        subplot_titles=("Success Probability", "Crash Probability",
-                       "Probability Density", "Cumulative Distribution"),
-        vertical_spacing=0.15,
-        horizontal_spacing=0.15
-    )
+    Figures are memoized per house edge, so callers must not mutate the
+    returned figure.
+    """
+    return _welcome_chart(round(house_edge, 4))
+
+@functools.lru_cache(maxsize=8)
+def _welcome_chart(house_edge: float) -> go.Figure:
+    multipliers = np.linspace(1, 20, 100)
+    probs = 1 - calculate_crash_probability(house_edge, multipliers)
     
-    # Success probability
-    fig.add_trace(
-        go.Scatter(
-            x=multipliers,
-            y=success_probs,
-            mode='lines',
-            name='Success',
-            line=dict(color='#38a169', width=3),
-            hovertemplate='<b>%{x:.2f}×</b><br>Success: %{y:.1%}<extra></extra>'
-        ),
-        row=1, col=1
-    )
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=multipliers,
+        y=probs,
+        mode='lines',
+        name='Probability',
+        line=dict(color='#667eea', width=3)
+    ))
     
-    # Crash probability
-    fig.add_trace(
-        go.Scatter(
-            x=multipliers,
-            y=crash_probs,
-            mode='lines',
-            name='Crash',
-            line=dict(color='#e53e3e', width=3),
-            hovertemplate='<b>%{x:.2f}×</b><br>Crash: %{y:.1%}<extra></extra>'
-        ),
-        row=1, col=2
+    fig.update_layout(
+        title="Probability of Reaching Different Multipliers",
+        xaxis_title="Multiplier (×)",
+        yaxis_title="Probability",
+        hovermode="x unified",
+        template="plotly_white",
+        height=400
     )
     
-    # Add reference lines
-    for threshold in [0.5, 0.25, 0.1, 0.01]:
-        # Find where success probability equals threshold
-        idx = np.abs(success_probs - threshold).argmin()
-        x_val = multipliers[idx]
-        
-        fig.add_vline(
-            x=x_val,
-            line_dash="dash",
-            line_color="gray",
-            opacity=0.5,
-            row=1, col=1
-        )
-        
-        fig.add_annotation(
-            x=x_val,
-            y=threshold,
-            text=f"{x_val:.1f}×",
-            showarrow=False,
-            yshift=10,
-            row=1, col=1
-        )
-    
-    # Probability density (derivative of CDF)
-    pdf = np.gradient(crash_probs, multipliers)
-    fig.add_trace(
-        go.Scatter(
-            x=multipliers,
-            y=pdf,
-            mode='lines',
-            name='Density',
-            line=dict(color='#667eea', width=2),
-            fill='tozeroy',
-            fillcolor='rgba(102, 126, 234, 0.1)',
-            hovertemplate='<b>%{x:.2f}×</b><br>Density: %{y:.4f}<extra></extra>'
-        ),
-        row=2, col=1
-    )
+    fig.add_hline(y=0.5, line_dash="dash", line_color="gray",
+                  annotation_text="50% chance",
+                  annotation_position="bottom right")
     
-    # Cumulative distribution
-    fig.add_trace(
-        go.Scatter(
-            x=multipliers,
-            y=crash_probs,
-            mode='lines',
-            name='CDF',
-            line=dict(color='#764ba2', width=3),
-            hovertemplate='<b>%{x:.2f}×</b><br>CDF: %{y:.1%}<extra></extra>'
-        ),
-        row=2, col=2
-    )
+    return fig
+
+def _histogram_bar(
+    hist: Tuple[np.ndarray, np.ndarray],
+    name: str,
+    color: str,
+    hovertemplate: str
+) -> go.Bar:
+    """
+    Draw np.histogram output as a bar trace.
     
-    # Update layout
-    fig.update_layout(
-        height=700,
-        showlegend=False,
-        template="plotly_white",
-        title_text=f"Probability Analysis (House Edge: {house_edge}%)",
-        title_x=0.5
+    Only the bin counts are sent to the browser instead of every sample.
+    """
+    counts, edges = hist
+    centers = 0.5 * (edges[:-1] + edges[1:])
+    
+    return go.Bar(
+        x=centers,
+        y=counts,
+        width=edges[1] - edges[0],
+        name=name,
+        marker_color=color,
+        opacity=0.7,
+        hovertemplate=hovertemplate
     )
+
+def _box_stats(values: np.ndarray) -> Dict:
+    """
+    Compute box plot quartiles, 1.5 IQR fences and outliers.
+    """
+    q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    lowerfence, upperfence = inside.min(), inside.max()
+    
+    return {
+        'q1': q1,
+        'median': median,
+        'q3': q3,
+        'lowerfence': lowerfence,
+        'upperfence': upperfence,
+        'outliers': values[(values < lowerfence) | (values > upperfence)]
+    }
+
+_SIMULATION_STATS = {
+    # key: (column, scale, histogram bins or None for box stats)
+    'balance_box': ('final_balance', 1.0, None),
+    'profit_hist': ('net_profit', 1.0, 50),
+    'winrate_hist': ('win_rate', 100.0, 30),
+    'roi_hist': ('roi', 1.0, 50),
+}
+
+def _simulation_stat(
+    results_df: pd.DataFrame,
+    key: str
+) -> Union[Dict, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Compute one _SIMULATION_STATS entry from its results column.
     
-    # Update axes
-    fig.update_xaxes(title_text="Multiplier (×)", row=1, col=1)
-    fig.update_xaxes(title_text="Multiplier (×)", row=1, col=2)
-    fig.update_xaxes(title_text="Multiplier (×)", row=2, col=1)
-    fig.update_xaxes(title_text="Multiplier (×)", row=2, col=2)
+    Returns:
+        Box statistics dict for balance_box, else (counts, edges) from
+        np.histogram
+    """
+    column, scale, bins = _SIMULATION_STATS[key]
+    values = results_df[column].to_numpy(dtype=np.float32)
+    if scale != 1.0:
+        values = values * scale
+    
+    if bins is None:
+        return _box_stats(values)
+    return np.histogram(values, bins=bins)
+
+def summarize_simulation(results_df: pd.DataFrame) -> Dict:
+    """
+    Compute the summary statistics drawn by create_simulation_chart.
     
-    fig.update_yaxes(title_text="Probability", row=1, col=1, tickformat=".0%")
-    fig.update_yaxes(title_text="Probability", row=1, col=2, tickformat=".0%")
-    fig.update_yaxes(title_text="Density", row=2, col=1)
-    fig.update_yaxes(title_text="Cumulative Probability", row=2, col=2, tickformat=".0%")
+    Args:
+        results_df: Simulation results from simulate_rounds
     
-    return fig
+    Returns:
+        Dictionary with balance_box (quartiles, fences and outliers of
+        final_balance) and profit_hist, winrate_hist and roi_hist
+        ((counts, edges) tuples as returned by np.histogram)
+    """
+    return {key: _simulation_stat(results_df, key) for key in _SIMULATION_STATS}
 
-def create_simulation_chart(results_df: pd.DataFrame) -> go.Figure:
+def create_simulation_chart(
+    results_df: pd.DataFrame,
+    house_edge: Optional[float] = None,
+    target_multiplier: Optional[float] = None,
+    precomputed: Optional[Dict] = None
+) -> go.Figure:
     """
     Create visualization for simulation results.
+    
+    The theoretical win rate line is drawn when theoretical_rate is
+    precomputed or both house_edge and target_multiplier are given.
+    
+    Args:
+        results_df: Simulation results from simulate_rounds
+        house_edge: House edge percentage used for the simulation
+        target_multiplier: Cash-out multiplier used for the simulation
+        precomputed: Optional statistics in the summarize_simulation format,
+            plus an optional theoretical_rate (0-1); missing keys are
+            computed from results_df
     """
     fig = make_subplots(
         rows=2, cols=2,
         subplot_titles=("Final Balance Distribution", "Profit/Loss Histogram",
                        "Win Rate Distribution", "ROI Distribution"),
-        specs=[[{"type": "box"}, {"type": "histogram"}],
-               [{"type": "histogram"}, {"type": "histogram"}]]
+        specs=[[{"type": "xy"}, {"type": "xy"}],
+               [{"type": "xy"}, {"type": "xy"}]]
     )
     
-    # Final balance box plot
+    # Use caller-supplied statistics, scanning results_df only for the rest
+    stats = dict(precomputed or {})
+    for key in _SIMULATION_STATS:
+        if key not in stats:
+            stats[key] = _simulation_stat(results_df, key)
+    
+    # Final balance box plot from precomputed quartiles, plus outlier points
+    box = stats['balance_box']
     fig.add_trace(
         go.Box(
-            y=results_df['final_balance'],
+            x=['Balance'],
+            q1=[box['q1']],
+            median=[box['median']],
+            q3=[box['q3']],
+            lowerfence=[box['lowerfence']],
+            upperfence=[box['upperfence']],
             name='Balance',
-            boxpoints='outliers',
             marker_color='#38a169',
             line_color='#2f855a'
         ),
         row=1, col=1
     )
+    outliers = box.get('outliers', ())
+    if len(outliers):
+        fig.add_trace(
+            go.Scatter(
+                x=['Balance'] * len(outliers),
+                y=outliers,
+                mode='markers',
+                name='Outliers',
+                marker_color='#38a169'
+            ),
+            row=1, col=1
+        )
     
     # Profit/Loss histogram
     fig.add_trace(
-        go.Histogram(
-            x=results_df['net_profit'],
+        _histogram_bar(
+            stats['profit_hist'],
             name='Profit/Loss',
-            nbinsx=50,
-            marker_color='#667eea',
-            opacity=0.7,
+            color='#667eea',
             hovertemplate='<b>%{x:.0f}</b><br>Count: %{y}<extra></extra>'
         ),
         row=1, col=2
@@ -181,35 +357,34 @@ def create_simulation_chart(results_df: pd.DataFrame) -> go.Figure:
     
     # Win rate distribution
     fig.add_trace(
-        go.Histogram(
-            x=results_df['win_rate'] * 100,
+        _histogram_bar(
+            stats['winrate_hist'],
             name='Win Rate',
-            nbinsx=30,
-            marker_color='#ed8936',
-            opacity=0.7,
+            color='#ed8936',
             hovertemplate='<b>%{x:.1f}%</b><br>Count: %{y}<extra></extra>'
         ),
         row=2, col=1
     )
     
-    # Add theoretical win rate line
-    theoretical_rate = 1 - (0.5 ** (1 - ((results_df['win_rate'].mean()/100)/np.log(2))))
-    fig.add_vline(
-        x=theoretical_rate * 100,
-        line_dash="dash",
-        line_color="green",
-        opacity=0.7,
-        row=2, col=1
-    )
+    # Add theoretical win rate line from the crash model
+    theoretical_rate = stats.get('theoretical_rate')
+    if theoretical_rate is None and house_edge is not None and target_multiplier is not None:
+        theoretical_rate = 1.0 - calculate_crash_probability(house_edge, target_multiplier)
+    if theoretical_rate is not None:
+        fig.add_vline(
+            x=theoretical_rate * 100,
+            line_dash="dash",
+            line_color="green",
+            opacity=0.7,
+            row=2, col=1
+        )
     
     # ROI distribution
     fig.add_trace(
-        go.Histogram(
-            x=results_df['roi'],
+        _histogram_bar(
+            stats['roi_hist'],
             name='ROI',
-            nbinsx=50,
-            marker_color='#9f7aea',
-            opacity=0.7,
+            color='#9f7aea',
             hovertemplate='<b>%{x:.1f}%</b><br>Count: %{y}<extra></extra>'
         ),
         row=2, col=2
@@ -245,26 +420,27 @@ def create_histogram_chart(results_df: pd.DataFrame) -> go.Figure:
     """
     Create histogram chart for simulation outcomes.
     """
-    # Calculate outcome categories
-    results_df['outcome'] = pd.cut(
-        results_df['net_profit'],
-        bins=[-float('inf'), -1000, -500, -100, 0, 100, 500, 1000, float('inf')],
-        labels=['<-$1000', '-$1000 to -$500', '-$500 to -$100', 
-                '-$100 to $0', '$0 to $100', '$100 to $500', 
-                '$500 to $1000', '>$1000']
-    )
-    
-    outcome_counts = results_df['outcome'].value_counts().sort_index()
+    # Calculate outcome categories; bins are right-inclusive like pd.cut
+    profits = results_df['net_profit'].to_numpy()
+    edges = np.array([-1000, -500, -100, 0, 100, 500, 1000], dtype=np.float64)
+    labels = ['<-$1000', '-$1000 to -$500', '-$500 to -$100',
+              '-$100 to $0', '$0 to $100', '$100 to $500',
+              '$500 to $1000', '>$1000']
+    idx = np.digitize(profits, edges, right=True)
+    counts = np.bincount(idx, minlength=len(labels))
+    
+    # Hover percentages only need float32 precision
+    total = counts.sum()
+    pct = np.multiply(counts, 100.0 / total, dtype=np.float32)
     
     fig = go.Figure()
     
     fig.add_trace(go.Bar(
-        x=outcome_counts.index,
-        y=outcome_counts.values,
-        marker_color=['#e53e3e', '#dd6b20', '#d69e2e', '#ecc94b',
-                     '#9ae6b4', '#68d391', '#38a169', '#2f855a'],
+        x=labels,
+        y=counts,
+        marker_color=_OUTCOME_COLORS,
         hovertemplate='<b>%{x}</b><br>Count: %{y}<br>Percentage: %{customdata:.1f}%<extra></extra>',
-        customdata=(outcome_counts.values / outcome_counts.sum() * 100)
+        customdata=pct
     ))
     
     fig.update_layout(
@@ -291,16 +467,17 @@ def create_strategy_comparison_chart(strategy_results: List[Dict]) -> go.Figure:
     
     # Add bars for each metric
     metrics = ['Avg Final Balance', 'Win Rate', 'Max Drawdown']
-    colors = ['#667eea', '#38a169', '#e53e3e']
+    x = df['Strategy'].to_numpy()
+    values = df[metrics].to_numpy()
     
     for i, metric in enumerate(metrics):
         fig.add_trace(go.Bar(
             name=metric,
-            x=df['Strategy'],
-            y=df[metric],
-            marker_color=colors[i],
+            x=x,
+            y=values[:, i],
+            marker_color=_METRIC_COLORS[i],
             opacity=0.8,
-            hovertemplate='<b>%{x}</b><br>' + metric + ': %{y:.2f}<extra></extra>'
+            hovertemplate=f'<b>%{{x}}</b><br>{metric}: %{{y:.2f}}<extra></extra>'
         ))
     
     fig.update_layout(